@@ -0,0 +1,385 @@
+"""GTK user interface for Gettext Coverage."""
+import gi
+gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
+from gi.repository import Gtk, Adw, Gdk, Gio, GLib, GObject
+
+import heapq
+import logging
+import operator
+import os
+import sys
+import threading
+from gettext_coverage import __version__
+from gettext_coverage.main import (
+    _, APP_ID, _load_settings, _save_settings,
+    _scan_locale_packages, _scan_cache_key, _load_scan_cache, _save_scan_cache,
+)
+
+RESULT_BATCH_SIZE = 64
+
+logger = logging.getLogger(__name__)
+
+
+class PkgItem(GObject.Object):
+    """List model item holding one package's coverage stats."""
+    __gtype_name__ = "GettextCoveragePkgItem"
+
+    package = GObject.Property(type=str, default="")
+    languages = GObject.Property(type=int, default=0)
+    total_locales = GObject.Property(type=int, default=0)
+    coverage = GObject.Property(type=float, default=0.0)
+
+
+class GettextCoverageWindow(Adw.ApplicationWindow):
+    def __init__(self, app):
+        settings = _load_settings()
+        super().__init__(application=app, title=_("Gettext Coverage"),
+                         default_width=settings["width"], default_height=settings["height"])
+        self.settings = settings
+        if settings["maximized"]:
+            self.maximize()
+        self.connect("close-request", self._on_close_request)
+        
+        self._packages = []
+        self._scanning = False
+
+        main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+
+        # Header
+        headerbar = Adw.HeaderBar()
+        title_widget = Adw.WindowTitle(title=_("Gettext Coverage"), subtitle="")
+        headerbar.set_title_widget(title_widget)
+        self._title_widget = title_widget
+
+        
+        scan_btn = Gtk.Button(icon_name="system-search-symbolic", tooltip_text=_("Scan packages"))
+        scan_btn.connect("clicked", self._on_scan)
+        headerbar.pack_start(scan_btn)
+
+        export_btn = Gtk.Button(icon_name="document-save-symbolic", tooltip_text=_("Export CSV"))
+        export_btn.connect("clicked", self._on_export)
+        headerbar.pack_end(export_btn)
+
+        # Menu
+        menu = Gio.Menu()
+        menu.append(_("Settings"), "app.settings")
+        menu.append(_("Copy Debug Info"), "app.copy-debug")
+        menu.append(_("Keyboard Shortcuts"), "app.shortcuts")
+        menu.append(_("About Gettext Coverage"), "app.about")
+        menu_btn = Gtk.MenuButton(icon_name="open-menu-symbolic", menu_model=menu)
+        headerbar.pack_end(menu_btn)
+
+        main_box.append(headerbar)
+
+        
+        # Main list
+        scroll = Gtk.ScrolledWindow(vexpand=True)
+        
+        # List model
+        self._list_store = Gio.ListStore.new(PkgItem)
+
+        # Rows are recycled by the factory, so only the visible ones exist.
+        # The subtitle template is translated once rather than on every bind.
+        self._subtitle_tmpl = _("%(langs)d / %(total)d languages (%(pct).1f%%)")
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_row_setup)
+        factory.connect("bind", self._on_row_bind)
+        self._listview = Gtk.ListView(model=Gtk.NoSelection(model=self._list_store), factory=factory)
+        self._listview.add_css_class("rich-list")
+        self._listview.set_margin_start(12)
+        self._listview.set_margin_end(12)
+        self._listview.set_margin_top(8)
+        self._listview.set_margin_bottom(8)
+        
+        # Status page
+        self._empty = Adw.StatusPage()
+        self._empty.set_icon_name("preferences-desktop-locale-symbolic")
+        self._empty.set_title(_("No data"))
+        self._empty.set_description(_("Click the search icon to scan installed packages."))
+        self._empty.set_vexpand(True)
+        
+        scroll.set_child(self._listview)
+        
+        self._stack = Gtk.Stack()
+        self._stack.add_named(self._empty, "empty")
+        self._stack.add_named(scroll, "list")
+        self._stack.set_vexpand(True)
+        main_box.append(self._stack)
+
+        # Status bar
+        self._status = Gtk.Label(label=_("Ready"), xalign=0)
+        self._status.set_margin_start(12)
+        self._status.set_margin_end(12)
+        self._status.set_margin_top(4)
+        self._status.set_margin_bottom(4)
+        self._status.add_css_class("dim-label")
+        main_box.append(self._status)
+
+        self.set_content(main_box)
+
+        if not self.settings.get("welcome_shown"):
+            GLib.idle_add(self._show_welcome)
+
+    def _show_welcome(self):
+        dialog = Adw.Dialog()
+        dialog.set_title(_("Welcome"))
+        dialog.set_content_width(420)
+        dialog.set_content_height(480)
+
+        page = Adw.StatusPage()
+        page.set_icon_name("preferences-desktop-locale-symbolic")
+        page.set_title(_("Welcome to Gettext Coverage"))
+        page.set_description(_("View translation statistics for your distribution.\n\n"
+            "✓ Scan installed packages for .po/.mo files\n"
+            "✓ Show translation percentage per package\n"
+            "✓ Sort by popularity and coverage\n"
+            "✓ Identify untranslated high-priority packages\n"
+            "✓ Export coverage report as CSV"))
+
+        btn = Gtk.Button(label=_("Get Started"))
+        btn.add_css_class("suggested-action")
+        btn.add_css_class("pill")
+        btn.set_halign(Gtk.Align.CENTER)
+        btn.set_margin_top(12)
+        btn.connect("clicked", self._on_welcome_close, dialog)
+        page.set_child(btn)
+
+        box = Adw.ToolbarView()
+        hb = Adw.HeaderBar()
+        hb.set_show_title(False)
+        box.add_top_bar(hb)
+        box.set_content(page)
+        dialog.set_child(box)
+        dialog.present(self)
+
+    def _on_close_request(self, *_args):
+        # The default size tracks the unmaximized size, which is what should
+        # be restored next time.
+        width, height = self.get_default_size()
+        self.settings.update(width=width, height=height, maximized=self.is_maximized())
+        try:
+            _save_settings(self.settings)
+        except OSError:
+            pass
+        return False
+
+    def _on_welcome_close(self, btn, dialog):
+        self.settings["welcome_shown"] = True
+        _save_settings(self.settings)
+        dialog.close()
+
+    
+    def _on_scan(self, btn):
+        if self._scanning:
+            return
+        self._scanning = True
+        self._status.set_text(_("Scanning packages..."))
+        limit = self.settings.get("show_worst", 0)
+        threading.Thread(target=self._do_scan, args=(limit,), daemon=True).start()
+
+    def _do_scan(self, limit=0):
+        try:
+            key = _scan_cache_key()
+            results = _load_scan_cache(key)
+            if results is None:
+                results = _scan_locale_packages(self._report_scan_progress)
+                _save_scan_cache(key, results)
+            by_coverage = operator.attrgetter("coverage")
+            # Only the worst-covered packages are shown when a limit is set, so
+            # a partial heap selection avoids sorting the whole list. The full
+            # list is kept for the CSV export.
+            packages = results
+            results = heapq.nsmallest(limit, results, key=by_coverage) if limit else sorted(results, key=by_coverage)
+        except Exception:
+            logger.exception("Scan failed")
+            GLib.idle_add(self._on_scan_failed)
+            return
+
+        # Hand the rows over in batches at idle priority so input and redraws
+        # are not starved while a large list is filled. Sources of equal
+        # priority run in the order they were added.
+        prio = GLib.PRIORITY_DEFAULT_IDLE
+        GLib.idle_add(self._begin_results, priority=prio)
+        for i in range(0, len(results), RESULT_BATCH_SIZE):
+            GLib.idle_add(self._append_batch, results[i:i + RESULT_BATCH_SIZE], priority=prio)
+        GLib.idle_add(self._finalize_scan, packages, priority=prio)
+
+    def _on_scan_failed(self):
+        self._scanning = False
+        self._status.set_text(_("Scan failed"))
+        return False
+
+    def _report_scan_progress(self, done, total):
+        if done % 16 == 0 or done == total:
+            GLib.idle_add(self._show_scan_progress, done, total)
+
+    def _show_scan_progress(self, done, total):
+        self._status.set_text(_("Scanning packages... (%(done)d / %(total)d languages)") %
+                              {"done": done, "total": total})
+        return False
+
+    def _on_row_setup(self, factory, list_item):
+        row = Adw.ActionRow()
+        # A LevelBar needs fewer CSS nodes than a ProgressBar, and its default
+        # low/high/full offsets on a 0..1 range color the coverage for free.
+        level = Gtk.LevelBar(min_value=0, max_value=1, mode=Gtk.LevelBarMode.CONTINUOUS)
+        level.set_valign(Gtk.Align.CENTER)
+        level.set_size_request(120, -1)
+        row.add_suffix(level)
+        row.level = level
+        list_item.set_child(row)
+
+    def _on_row_bind(self, factory, list_item):
+        pkg = list_item.get_item()
+        row = list_item.get_child()
+        row.set_title(pkg.package)
+        row.set_subtitle(self._subtitle_tmpl %
+                         {"langs": pkg.languages, "total": pkg.total_locales, "pct": pkg.coverage})
+        row.level.set_value(pkg.coverage / 100)
+
+    def _begin_results(self):
+        self._list_store.remove_all()
+        self._stack.set_visible_child_name("list")
+        return False
+
+    def _append_batch(self, batch):
+        items = [PkgItem(package=p.package, languages=p.languages,
+                         total_locales=p.total_locales, coverage=p.coverage) for p in batch]
+        self._list_store.splice(self._list_store.get_n_items(), 0, items)
+        return False
+
+    def _finalize_scan(self, packages):
+        self._packages = packages
+        self._scanning = False
+        self._status.set_text(_("Found %(count)d packages") % {"count": len(packages)})
+        return False
+
+    def _on_export(self, btn):
+        if not self._packages:
+            return
+        import datetime
+        dialog = Gtk.FileDialog()
+        dialog.set_title(_("Export Coverage Report"))
+        dialog.set_initial_name(f"coverage-{datetime.date.today().isoformat()}.csv")
+        dialog.save(self, None, self._on_export_done)
+
+    def _on_export_done(self, dialog, result):
+        try:
+            f = dialog.save_finish(result)
+            path = f.get_path()
+            import csv
+            packages = sorted(self._packages, key=operator.attrgetter("coverage"))
+            rows = [(p.package, p.languages, p.total_locales, p.coverage) for p in packages]
+            with open(path, "w", newline="", buffering=1 << 20, encoding="utf-8") as csvf:
+                w = csv.writer(csvf)
+                w.writerow(["Package", "Languages", "Total Locales", "Coverage %"])
+                w.writerows(rows)
+            self._status.set_text(_("Exported to %s") % path)
+        except (GLib.Error, OSError):
+            pass
+
+
+class GettextCoverageApp(Adw.Application):
+    def __init__(self):
+        super().__init__(application_id=APP_ID, flags=Gio.ApplicationFlags.FLAGS_NONE)
+        self.window = None
+        # Static dialogs are built on first use and reused afterwards.
+        self._about_dialog = None
+        self._shortcuts_window = None
+
+        for name, callback in [
+            ("settings", self._on_settings),
+            ("copy-debug", self._on_copy_debug),
+            ("shortcuts", self._on_shortcuts),
+            ("about", self._on_about),
+            ("quit", self._on_quit),
+        ]:
+            action = Gio.SimpleAction.new(name, None)
+            action.connect("activate", callback)
+            self.add_action(action)
+
+        self.set_accels_for_action("app.quit", ["<Ctrl>q"])
+        self.set_accels_for_action("app.shortcuts", ["<Ctrl>slash"])
+
+    def do_activate(self):
+        if not self.window:
+            self.window = GettextCoverageWindow(self)
+        self.window.present()
+
+    def _on_settings(self, *_args):
+        if not self.window:
+            return
+        dialog = Adw.PreferencesDialog()
+        dialog.set_title(_("Settings"))
+        page = Adw.PreferencesPage()
+        
+        group = Adw.PreferencesGroup(title=_("Scanning"))
+        row = Adw.SwitchRow(title=_("Include system packages"))
+        row.set_active(self.window.settings.get("include_system", True))
+        group.add(row)
+        limit_row = Adw.SpinRow.new_with_range(0, 10000, 10)
+        limit_row.set_title(_("Show worst packages"))
+        limit_row.set_subtitle(_("Number of least translated packages to list, 0 shows all"))
+        limit_row.set_value(self.window.settings.get("show_worst", 0))
+        group.add(limit_row)
+        page.add(group)
+        dialog.add(page)
+        dialog.connect("closed", self._on_settings_closed, limit_row)
+        dialog.present(self.window)
+
+    def _on_settings_closed(self, dialog, limit_row):
+        self.window.settings["show_worst"] = int(limit_row.get_value())
+        _save_settings(self.window.settings)
+
+    def _on_copy_debug(self, *_args):
+        if not self.window:
+            return
+        info = (
+            f"Gettext Coverage {__version__}\n"
+            f"Python {sys.version}\n"
+            f"GTK {Gtk.MAJOR_VERSION}.{Gtk.MINOR_VERSION}\n"
+            f"Adw {Adw.MAJOR_VERSION}.{Adw.MINOR_VERSION}\n"
+            f"OS: {os.uname().sysname} {os.uname().release}\n"
+        )
+        clipboard = Gdk.Display.get_default().get_clipboard()
+        clipboard.set(info)
+        self.window._status.set_text(_("Debug info copied"))
+
+    def _on_shortcuts(self, *_args):
+        if not self.window:
+            return
+        if self._shortcuts_window is None:
+            dialog = Gtk.ShortcutsWindow(transient_for=self.window, hide_on_close=True)
+            section = Gtk.ShortcutsSection(visible=True)
+            group = Gtk.ShortcutsGroup(title=_("General"), visible=True)
+            for accel, title in [
+                ("<Ctrl>q", _("Quit")),
+                ("<Ctrl>slash", _("Keyboard shortcuts")),
+            ]:
+                group.append(Gtk.ShortcutsShortcut(accelerator=accel, title=title, visible=True))
+            section.append(group)
+            dialog.append(section)
+            self._shortcuts_window = dialog
+        self._shortcuts_window.present()
+
+    def _on_about(self, *_args):
+        if self._about_dialog is None:
+            self._about_dialog = Adw.AboutDialog(
+                application_name=_("Gettext Coverage"),
+                application_icon="preferences-desktop-locale-symbolic",
+                version=__version__,
+                developer_name="Daniel Nylander",
+                website="https://github.com/yeager/gettext-coverage",
+                license_type=Gtk.License.GPL_3_0,
+                issue_url="https://github.com/yeager/gettext-coverage/issues",
+                comments=_("Shows translation coverage per package, identifies most-used untranslated packages."),
+            )
+        self._about_dialog.present(self.window)
+
+    def _on_quit(self, *_args):
+        # quit() alone destroys the window without a close-request, which is
+        # where the window state gets saved.
+        if self.window:
+            self.window.close()
+        self.quit()